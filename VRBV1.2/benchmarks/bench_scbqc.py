@@ -0,0 +1,514 @@
+"""
+Benchmarks y verificación del contrato de datos entre adquisición, análisis,
+reporte e interfaz gráfica, usando tarjetas sintéticas de 24 canales.
+
+Mide la conversión a temperatura, el análisis por canal, la escritura del archivo
+combinado, la generación de gráficas y la actualización de la interfaz. Los tiempos
+pueden guardarse como línea base y compararse en ejecuciones posteriores. La línea
+base depende de la máquina (una Raspberry Pi 4 es varias veces más lenta que un PC),
+por eso linea_base.json no se versiona: se genera con --guardar en cada equipo.
+
+El contrato ejecuta la rampa de adquisición real con instrumentos y GPIO falsos y
+revisa los archivos que escribe; con pantalla, también revisa la tabla y la gráfica
+de la interfaz.
+
+Uso: python3 benchmarks/bench_scbqc.py [--tamanos 54 500 5000] [--repeticiones 3]
+                                       [--guardar] [--comparar] [--tolerancia 0.25] [--solo-contrato] [--sin-gui]
+
+Autor: Diego Alejandro Vera Ortega
+Fecha: 18/11/2024
+"""
+
+import os
+import sys
+import ast
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import io
+import types
+import importlib
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+DIRECTORIO_BENCH = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIO_VRB = os.path.dirname(DIRECTORIO_BENCH)
+DIRECTORIO_SRC = os.path.join(DIRECTORIO_VRB, "src")
+RUTA_LINEA_BASE = os.path.join(DIRECTORIO_BENCH, "linea_base.json")
+sys.path.insert(0, DIRECTORIO_SRC)
+
+import numpy as np
+import analisis_datos
+import reporte
+from analisis_datos import CLAVES_DATOS, crear_datos, procesar_y_guardar_datos, validar_datos
+from conversiones import convertir_resistencia_a_temperatura, corriente_a_temperatura, temperature
+from plan_canales import nombre_canal
+from resultados_canal import leer_deltas, leer_metricas
+
+CANALES = list(nombre_canal.values())
+TAMANO_RAMPA = 54  # Puntos de la rampa real: 3.286 V a 7.586 V en pasos de 0.080 V
+
+
+def generar_datos_canal(muestras, semilla, threshold_temp=2.0):
+    """
+    Genera los datos sintéticos de un canal con la forma que entrega el script de adquisición.
+    """
+    rng = np.random.default_rng(semilla)
+    voltajes = 3.286 + 0.080 * np.arange(muestras)
+    temperaturas_vrb = np.linspace(5.0, 95.0, muestras)
+    temperaturas_scb = temperaturas_vrb + rng.normal(0.0, 0.5 + semilla % 4, muestras)
+    resistencias = 10000 * (1 + 3.9083e-3 * temperaturas_vrb)
+    corrientes = (1000 * 0.79932) / resistencias * 1000
+    voltajes_scb = 0.79932 * (1 + 1000 / (10000 * (1 + 3.9083e-3 * temperaturas_scb)))
+    return crear_datos(
+        voltajes.tolist(), corrientes.tolist(), voltajes_scb.tolist(),
+        temperaturas_scb.tolist(), temperaturas_vrb.tolist(), threshold_temp
+    )
+
+
+def generar_tarjeta(muestras):
+    """
+    Genera una tarjeta sintética completa: {canal: datos} para los 24 canales.
+    """
+    return {canal: generar_datos_canal(muestras, i) for i, canal in enumerate(CANALES)}
+
+
+def guardar_tarjeta(tarjeta, directorio_prueba):
+    """
+    Procesa y guarda todos los canales de la tarjeta como lo hace el script de adquisición.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        for canal, datos in tarjeta.items():
+            procesar_y_guardar_datos(
+                datos, os.path.join(directorio_prueba, canal), canal,
+                datos["threshold_temp"], directorio_prueba
+            )
+
+
+def medir(funcion, repeticiones):
+    """
+    Ejecuta la función `repeticiones` veces y devuelve el menor tiempo en segundos.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+# ---------------------------------------------------------------------------
+# Contrato de datos
+# ---------------------------------------------------------------------------
+
+def _claves_subindice(ruta_modulo, variable="datos"):
+    """
+    Devuelve las claves de texto usadas como variable["clave"] en un módulo.
+    """
+    with open(ruta_modulo, encoding="utf-8") as archivo:
+        arbol = ast.parse(archivo.read())
+    return {
+        nodo.slice.value for nodo in ast.walk(arbol)
+        if isinstance(nodo, ast.Subscript) and isinstance(nodo.value, ast.Name)
+        and nodo.value.id == variable and isinstance(nodo.slice, ast.Constant)
+        and isinstance(nodo.slice.value, str)
+    }
+
+
+def contrato_claves_analisis():
+    claves = _claves_subindice(os.path.join(DIRECTORIO_SRC, "analisis_datos.py"))
+    desconocidas = claves - set(CLAVES_DATOS)
+    assert not desconocidas, f"analisis_datos lee claves que no existen en los datos: {desconocidas}"
+
+
+class GpioFalso:
+    """
+    Sustituto de RPi.GPIO: guarda el nivel de cada pin y las direcciones escritas en bloque.
+    Con `invertir_lectura` la relectura devuelve el nivel contrario (simula una falla de cableado).
+    """
+
+    def __init__(self, invertir_lectura=False):
+        self.niveles = {}
+        self.escrituras = []
+        self.liberado = False
+        self.invertir_lectura = invertir_lectura
+
+    def output(self, pines, valores):
+        self.escrituras.append(tuple(valores))
+        self.niveles.update(zip(pines, valores))
+
+    def input(self, pin):
+        return 1 - self.niveles[pin] if self.invertir_lectura else self.niveles[pin]
+
+    def cleanup(self):
+        self.liberado = True
+
+
+class FuenteFalsa:
+    def __init__(self):
+        self.comandos = []
+
+    def write(self, comando):
+        self.comandos.append(comando)
+
+
+class AmperimetroFalso:
+    current = 70e-6  # A
+
+
+class VoltimetroFalso:
+    voltage = 0.87  # V
+
+
+def importar_adquisicion():
+    """
+    Importa adquisicion_datos fuera de la Raspberry Pi: las librerías de instrumentos y de GPIO
+    que no estén instaladas se reemplazan por módulos vacíos (los instrumentos y el GPIO reales
+    nunca se usan, la prueba los sustituye por los objetos falsos).
+    """
+    for nombre in ("pyvisa", "pymeasure.instruments.agilent", "RPi.GPIO"):
+        try:
+            importlib.import_module(nombre)
+        except ImportError:
+            partes = nombre.split(".")
+            for i in range(1, len(partes) + 1):
+                sys.modules.setdefault(".".join(partes[:i]), types.ModuleType(".".join(partes[:i])))
+            for i in range(1, len(partes)):
+                setattr(sys.modules[".".join(partes[:i])], partes[i], sys.modules[".".join(partes[:i + 1])])
+    sys.modules["pymeasure.instruments.agilent"].__dict__.setdefault("Agilent34450A", object)
+    import adquisicion_datos
+    return adquisicion_datos
+
+
+def _ejecutar_rampa(adquisicion, gpio, fuente, directorio, canales):
+    """
+    Ejecuta la rampa real con instrumentos y GPIO falsos y sin tiempos de espera. Devuelve el plan.
+    """
+    plan = adquisicion.crear_plan(canales)
+    gpio_real = adquisicion.GPIO
+    adquisicion.GPIO = gpio
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            adquisicion.rampa_voltaje_e36233a_por_canal(
+                AmperimetroFalso(), VoltimetroFalso(), fuente, plan, directorio, "contrato", 2.0,
+                inicio=3.286, fin=3.6, paso=0.080, tiempo_espera=0, verificar=True
+            )
+    finally:
+        adquisicion.GPIO = gpio_real
+    return plan
+
+
+def contrato_adquisicion_escribe_archivos():
+    adquisicion = importar_adquisicion()
+    directorio = tempfile.mkdtemp(prefix="scbqc_contrato_")
+    try:
+        gpio, fuente = GpioFalso(), FuenteFalsa()
+        plan = _ejecutar_rampa(adquisicion, gpio, fuente, directorio, ["ptb2", "pta1"])
+        assert gpio.escrituras == [canal.valores for canal in plan], "Direcciones escritas distintas a las del plan"
+        assert gpio.liberado, "La rampa no libera el GPIO al terminar"
+        assert "OUTP OFF" not in fuente.comandos, "La rampa apaga CH1 sin que haya un error"
+
+        parametros = reporte.leer_parametros(directorio)
+        assert parametros["canales"] == ["ptb2", "pta1"], f"Canales en los parámetros: {parametros.get('canales')}"
+        assert parametros["temp_threshold"] == 2.0, "Umbral distinto en los parámetros"
+        for canal in plan.nombres():
+            ruta_canal = os.path.join(directorio, canal)
+            leidos = reporte.leer_datos_canal(os.path.join(ruta_canal, f"{canal}_datos.csv"))
+            assert len(leidos["voltajes"]) == 4, f"{canal}: la rampa de 3.286 V a 3.6 V debe tener 4 puntos"
+            metricas = leer_metricas(os.path.join(ruta_canal, f"{canal}_metricas.csv"))
+            esperadas = reporte.calcular_metricas(leidos["delta_temperaturas"], 2.0)
+            assert abs(metricas["error_cuadratico_medio"] - esperadas["rmsd"]) < 1e-3, f"{canal}: RMSD distinto"
+        assert list(reporte.buscar_canales(directorio)) == ["pta1", "ptb2"], "El reporte no encuentra los canales"
+
+        gpio, fuente = GpioFalso(invertir_lectura=True), FuenteFalsa()
+        try:
+            _ejecutar_rampa(adquisicion, gpio, fuente, directorio, ["pta1"])
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("La rampa no detecta una dirección mal leída")
+        assert gpio.liberado, "La rampa no libera el GPIO tras un error"
+        assert fuente.comandos[-2:] == ["INST:SEL CH1", "OUTP OFF"], "La rampa no apaga CH1 tras un error"
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def contrato_crear_datos():
+    datos = generar_datos_canal(10, 0)
+    assert list(datos) == CLAVES_DATOS, f"Claves de crear_datos: {list(datos)}"
+    validar_datos(datos)
+
+
+def contrato_validar_datos():
+    datos = generar_datos_canal(10, 0)
+    for clave in CLAVES_DATOS:
+        incompleto = {k: v for k, v in datos.items() if k != clave}
+        try:
+            validar_datos(incompleto)
+        except ValueError:
+            continue
+        raise AssertionError(f"validar_datos acepta datos sin la clave {clave}")
+    desigual = dict(datos, corrientes=datos["corrientes"][:-1])
+    try:
+        validar_datos(desigual)
+    except ValueError:
+        return
+    raise AssertionError("validar_datos acepta series de distinta longitud")
+
+
+def contrato_archivos_de_canal():
+    directorio = tempfile.mkdtemp(prefix="scbqc_contrato_")
+    try:
+        tarjeta = {canal: generar_datos_canal(20, i) for i, canal in enumerate(CANALES[:3])}
+        tarjeta[CANALES[3]] = generar_datos_canal(25, 3)  # Canal con más puntos
+        guardar_tarjeta(tarjeta, directorio)
+
+        for canal, datos in tarjeta.items():
+            ruta_canal = os.path.join(directorio, canal)
+            metricas_interfaz = leer_metricas(os.path.join(ruta_canal, f"{canal}_metricas.csv"))
+            rmsd = metricas_interfaz["error_cuadratico_medio"]
+            error_maximo = metricas_interfaz["error_maximo"]
+            estado = metricas_interfaz["estado_calidad"]
+            leidos = reporte.leer_datos_canal(os.path.join(ruta_canal, f"{canal}_datos.csv"))
+            assert len(leidos["voltajes"]) == len(datos["voltajes"]), f"{canal}: filas del CSV de datos"
+            metricas = reporte.calcular_metricas(leidos["delta_temperaturas"], datos["threshold_temp"])
+            assert abs(metricas["rmsd"] - rmsd) < 1e-3, f"{canal}: RMSD del reporte distinto al de las métricas"
+            assert abs(metricas["error_maximo"] - error_maximo) < 1e-3, f"{canal}: error máximo distinto"
+            assert estado == ("Pass" if metricas["pasa"] else "No Pass"), f"{canal}: estado distinto"
+            temperaturas_vrb, deltas = leer_deltas(os.path.join(ruta_canal, f"{canal}_datos.csv"))
+            assert np.allclose(temperaturas_vrb, datos["temperaturas_vrb"]), f"{canal}: Temperatura VRB distinta"
+            assert np.allclose(deltas, leidos["delta_temperaturas"]), f"{canal}: deltas distintos"
+            for archivo in ("temperatura_vs_voltaje_scb", "delta_vs_temperatura_vrb", "histograma_delta_temperatura"):
+                assert os.path.exists(os.path.join(ruta_canal, f"{canal}_{archivo}.png")), f"{canal}: falta {archivo}"
+
+        import pandas as pd
+        combinado = pd.read_csv(os.path.join(directorio, "combined_deltas.csv"))
+        assert list(combinado.columns) == ["Temperatura VRB"] + list(tarjeta), \
+            f"Columnas de combined_deltas.csv: {list(combinado.columns)}"
+        assert len(combinado) == 25, "combined_deltas.csv no conserva el canal más largo"
+
+        assert list(reporte.buscar_canales(directorio)) == sorted(tarjeta, key=reporte.clave_orden_canal)
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def contrato_interfaz_muestra_resultados(gui):
+    directorio = tempfile.mkdtemp(prefix="scbqc_contrato_")
+    try:
+        tarjeta = {canal: generar_datos_canal(20, i) for i, canal in enumerate(CANALES[:3])}
+        guardar_tarjeta(tarjeta, directorio)
+        gui.entrada_directorio.delete(0, "end")
+        gui.entrada_directorio.insert(0, os.path.dirname(directorio))
+        gui.entrada_prueba.delete(0, "end")
+        gui.entrada_prueba.insert(0, os.path.basename(directorio))
+        gui.actualizar_canales_prueba()
+        gui.firma_grafica = None
+        gui.mostrar_metricas_y_graficas()
+
+        filas = [gui.tabla_resultados.item(fila, "values") for fila in gui.tabla_resultados.get_children()]
+        assert [fila[0] for fila in filas] == sorted(tarjeta, key=reporte.clave_orden_canal), \
+            f"Canales en la tabla: {[fila[0] for fila in filas]}"
+        for fila in filas:
+            metricas = leer_metricas(os.path.join(directorio, fila[0], f"{fila[0]}_metricas.csv"))
+            assert fila[1] == metricas["estado_calidad"], f"{fila[0]}: estado distinto en la tabla"
+            assert float(fila[2]) == metricas["error_cuadratico_medio"], f"{fila[0]}: RMSD distinto en la tabla"
+        lineas = gui.canvas_deltas.figure.axes[0].lines
+        assert [linea.get_label() for linea in lineas] == [fila[0] for fila in filas], "Canales en la gráfica"
+        for linea in lineas:
+            temperaturas_vrb = tarjeta[linea.get_label()]["temperaturas_vrb"]
+            assert np.allclose(linea.get_xdata(), temperaturas_vrb), f"{linea.get_label()}: Temperatura VRB graficada"
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+CONTRATOS = [
+    contrato_claves_analisis,
+    contrato_crear_datos,
+    contrato_validar_datos,
+    contrato_archivos_de_canal,
+    contrato_adquisicion_escribe_archivos,
+]
+
+
+def _verificar(nombre, funcion, *argumentos):
+    try:
+        funcion(*argumentos)
+        print(f"  OK       {nombre}")
+        return True
+    except Exception as e:
+        print(f"  FALLA    {nombre}: {e}")
+        return False
+
+
+def verificar_contrato(gui=None):
+    """
+    Ejecuta las verificaciones del contrato de datos. Devuelve True si todas pasan.
+    La verificación de la interfaz se omite si no hay interfaz (sin pantalla o con --sin-gui).
+    """
+    correcto = all([_verificar(contrato.__name__, contrato) for contrato in CONTRATOS])
+    if gui is None:
+        print("  OMITIDO  contrato_interfaz_muestra_resultados: sin interfaz gráfica")
+    else:
+        correcto = _verificar("contrato_interfaz_muestra_resultados", contrato_interfaz_muestra_resultados, gui) \
+            and correcto
+    return correcto
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def bench_conversiones(resultados, repeticiones, muestras=2000):
+    corrientes = list(np.linspace(58.0, 79.0, muestras))
+    resistencias = [corriente_a_temperatura(c) for c in corrientes]
+
+    resultados[f"conversion.corriente_a_temperatura_x{muestras}"] = medir(
+        lambda: [corriente_a_temperatura(c) for c in corrientes], repeticiones
+    )
+    resultados[f"conversion.convertir_resistencia_a_temperatura_x{muestras}"] = medir(
+        lambda: [convertir_resistencia_a_temperatura(r) for r in resistencias], repeticiones
+    )
+    resultados[f"conversion.temperature_x{muestras}"] = medir(
+        lambda: [temperature(r) for r in resistencias], repeticiones
+    )
+
+
+def bench_tarjeta(resultados, repeticiones, muestras, gui):
+    tarjeta = generar_tarjeta(muestras)
+    prefijo = f"n{muestras}"
+    directorio = tempfile.mkdtemp(prefix="scbqc_bench_")
+    try:
+        def analisis_completo():
+            shutil.rmtree(directorio, ignore_errors=True)
+            os.makedirs(directorio)
+            guardar_tarjeta(tarjeta, directorio)
+        resultados[f"{prefijo}.analisis_por_canal"] = medir(analisis_completo, repeticiones) / len(tarjeta)
+
+        def combinado():
+            ruta = os.path.join(directorio, "combined_bench.csv")
+            if os.path.exists(ruta):
+                os.remove(ruta)
+            for canal, datos in tarjeta.items():
+                delta = np.array(datos["temperaturas_vrb"]) - np.array(datos["temperaturas_scb"])
+                analisis_datos.guardar_csv_combinado(ruta, canal, datos["temperaturas_vrb"], delta)
+        resultados[f"{prefijo}.csv_combinado_24_canales"] = medir(combinado, repeticiones)
+
+        def graficas_por_canal():
+            for canal, datos in tarjeta.items():
+                delta = np.array(datos["temperaturas_vrb"]) - np.array(datos["temperaturas_scb"])
+                analisis_datos.generar_graficas(datos, delta, os.path.join(directorio, canal), canal)
+        resultados[f"{prefijo}.graficas_72_archivos"] = medir(graficas_por_canal, repeticiones)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultados[f"{prefijo}.reporte_html"] = medir(lambda: reporte.generar_reporte(directorio), repeticiones)
+
+        if gui is not None:
+            gui.entrada_directorio.delete(0, "end")
+            gui.entrada_directorio.insert(0, os.path.dirname(directorio))
+            gui.entrada_prueba.delete(0, "end")
+            gui.entrada_prueba.insert(0, os.path.basename(directorio))
+            gui.actualizar_canales_prueba()
+
+            def refrescar(redibujar):
+                # update() procesa el draw_idle pendiente: incluye la tabla y, si hay datos nuevos, la gráfica
+                if redibujar:
+                    gui.firma_grafica = None
+                gui.mostrar_metricas_y_graficas()
+                gui.ventana.update()
+            resultados[f"{prefijo}.gui_refresco"] = medir(lambda: refrescar(True), repeticiones)
+            resultados[f"{prefijo}.gui_refresco_sin_cambios"] = medir(lambda: refrescar(False), repeticiones)
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def cargar_interfaz():
+    """
+    Importa la interfaz gráfica sin iniciar el bucle principal. Devuelve None si no hay pantalla.
+    """
+    # No mezclar los tiempos del benchmark con el registro de arranques en frío (tiempos_arranque.csv)
+    os.environ["SCBQC_REGISTRAR_ARRANQUE"] = "0"
+    try:
+        sys.path.insert(0, DIRECTORIO_VRB)
+        with contextlib.redirect_stdout(io.StringIO()):
+            import scbqc
+        return scbqc
+    except Exception as e:
+        print(f"Benchmark de la interfaz omitido: {e}")
+        return None
+
+
+def comparar(resultados, linea_base, tolerancia):
+    """
+    Compara los resultados con la línea base. Devuelve la lista de regresiones.
+    """
+    regresiones = []
+    print(f"\n{'Benchmark':48s} {'Base':>12s} {'Actual':>12s} {'Cambio':>8s}")
+    for nombre, actual in resultados.items():
+        base = linea_base.get(nombre)
+        if base is None:
+            print(f"{nombre:48s} {'-':>12s} {actual:12.6f}")
+            continue
+        cambio = actual / base - 1
+        marca = "  REGRESIÓN" if cambio > tolerancia else ""
+        print(f"{nombre:48s} {base:12.6f} {actual:12.6f} {cambio:+8.1%}{marca}")
+        if marca:
+            regresiones.append(nombre)
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks y contrato de datos de SCB QC")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[TAMANO_RAMPA, 500, 5000],
+                        help="Puntos por canal de las tarjetas sintéticas")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--guardar", action="store_true", help="Guardar los resultados como línea base")
+    parser.add_argument("--comparar", action="store_true", help="Comparar con la línea base guardada")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Aumento relativo aceptado (0.25 = 25 %%)")
+    parser.add_argument("--solo-contrato", action="store_true", help="Solo verificar el contrato de datos")
+    parser.add_argument("--sin-gui", action="store_true", help="Omitir el benchmark de la interfaz")
+    argumentos = parser.parse_args()
+
+    gui = None if argumentos.sin_gui else cargar_interfaz()
+    print("Contrato de datos:")
+    if not verificar_contrato(gui):
+        sys.exit(1)
+    if argumentos.solo_contrato:
+        return
+
+    resultados = {}
+    bench_conversiones(resultados, argumentos.repeticiones)
+    for muestras in argumentos.tamanos:
+        print(f"Tarjeta sintética de 24 canales x {muestras} puntos...")
+        bench_tarjeta(resultados, argumentos.repeticiones, muestras, gui)
+
+    print(f"\n{'Benchmark':48s} {'Tiempo (s)':>12s}")
+    for nombre, tiempo in resultados.items():
+        print(f"{nombre:48s} {tiempo:12.6f}")
+
+    if argumentos.comparar:
+        if not os.path.exists(RUTA_LINEA_BASE):
+            print(f"No existe la línea base {RUTA_LINEA_BASE}; ejecute con --guardar")
+            sys.exit(1)
+        with open(RUTA_LINEA_BASE) as archivo:
+            linea_base = json.load(archivo)["resultados"]
+        if comparar(resultados, linea_base, argumentos.tolerancia):
+            sys.exit(1)
+
+    if argumentos.guardar:
+        with open(RUTA_LINEA_BASE, mode='w') as archivo:
+            json.dump({
+                "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "plataforma": platform.platform(),
+                "python": platform.python_version(),
+                "repeticiones": argumentos.repeticiones,
+                "resultados": resultados,
+            }, archivo, indent=2)
+        print(f"Línea base guardada en {RUTA_LINEA_BASE}")
+
+
+if __name__ == "__main__":
+    main()
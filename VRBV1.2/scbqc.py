@@ -5,19 +5,99 @@ Permite ejecutar scripts de adquisición, mostrar resultados, y gestionar métri
 Autor: Diego Alejandro Vera Ortega
 Fecha: 18/11/2024
 """
+import time
+TIEMPO_INICIO = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import subprocess
 import os
-import time
-from PIL import Image, ImageTk
-import pandas as pd
-import csv
-import matplotlib.pyplot as plt
+import sys
+
+# Rutas configurables mediante variables de entorno
+DIRECTORIO_VRB = os.environ.get("SCBQC_DIR", os.path.dirname(os.path.abspath(__file__)))
+DIRECTORIO_SRC = os.environ.get("SCBQC_SRC_DIR", os.path.join(DIRECTORIO_VRB, "src"))
+DIRECTORIO_LOGOS = os.environ.get("SCBQC_LOGO_DIR", os.path.join(DIRECTORIO_VRB, "logo"))
+DIRECTORIO_CACHE = os.environ.get(
+    "SCBQC_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "scbqc")
+)
+LOGO_ATLAS = os.environ.get("SCBQC_LOGO_ATLAS", "ATLAS logo default transparent RGBHEX 300ppi.png")
+LOGO_UNIVERSIDAD = os.environ.get("SCBQC_LOGO_UNIVERSIDAD", "LogoPUJ.png")
+# SCBQC_REGISTRAR_ARRANQUE=0 desactiva el registro de tiempos de arranque (p. ej. al importar desde los benchmarks)
+REGISTRAR_ARRANQUE = os.environ.get("SCBQC_REGISTRAR_ARRANQUE", "1") != "0"
+
+# Lectura de resultados y plan de canales (módulos livianos, sin NumPy/Pandas/Matplotlib)
+sys.path.insert(0, DIRECTORIO_SRC)
+from resultados_canal import leer_deltas, leer_metricas
+from plan_canales import canales_desde_texto, crear_plan
+
+# Tiempos de las fases de arranque (fase, segundos desde TIEMPO_INICIO)
+tiempos_arranque = [("imports", time.perf_counter() - TIEMPO_INICIO)]
 
 # Variable global para el proceso de adquisición
 proceso = None
+modo_proceso = "adquisicion"  # "adquisicion" o "soak"
+proceso_reporte = None  # Proceso de generación del reporte
 canales_actuales = set()  # Lista de canales detectados
+canvas_deltas = None  # Gráfica de deltas integrada en la interfaz (se crea al primer uso)
+firma_grafica = None  # Archivos (y fechas de modificación) con los que se dibujó la gráfica actual
+
+def registrar_tiempo(fase):
+    """
+    Registra el tiempo transcurrido desde el inicio del programa hasta la fase dada.
+    """
+    tiempos_arranque.append((fase, time.perf_counter() - TIEMPO_INICIO))
+
+def reportar_tiempos_arranque():
+    """
+    Muestra los tiempos de arranque y los agrega a tiempos_arranque.csv en el directorio de caché,
+    para poder seguir regresiones entre versiones.
+    """
+    registrar_tiempo("ventana_lista")
+    print("Tiempos de arranque: " + ", ".join(f"{fase}={t:.3f}s" for fase, t in tiempos_arranque))
+    try:
+        os.makedirs(DIRECTORIO_CACHE, exist_ok=True)
+        ruta_tiempos = os.path.join(DIRECTORIO_CACHE, "tiempos_arranque.csv")
+        nuevo = not os.path.exists(ruta_tiempos)
+        with open(ruta_tiempos, mode='a') as archivo_tiempos:
+            if nuevo:
+                archivo_tiempos.write("fecha," + ",".join(fase for fase, _ in tiempos_arranque) + "\n")
+            archivo_tiempos.write(
+                time.strftime("%Y-%m-%d %H:%M:%S") + "," + ",".join(f"{t:.4f}" for _, t in tiempos_arranque) + "\n"
+            )
+    except OSError as e:
+        print(f"No se pudieron guardar los tiempos de arranque: {e}")
+
+def cargar_logo(nombre_archivo, tamano):
+    """
+    Carga un logo redimensionado. La versión redimensionada se guarda en el directorio de caché
+    para que los siguientes arranques la lean directamente sin cargar PIL.
+
+    Parameters:
+    - nombre_archivo: Nombre del logo dentro de DIRECTORIO_LOGOS (o ruta absoluta).
+    - tamano: Tupla (ancho, alto) en píxeles.
+
+    Returns:
+    - Imagen para Tkinter, o None si el logo no existe.
+    """
+    ruta_logo = os.path.join(DIRECTORIO_LOGOS, nombre_archivo)
+    if not os.path.exists(ruta_logo):
+        print(f"Logo no encontrado: {ruta_logo}")
+        return None
+
+    nombre_base = os.path.splitext(os.path.basename(ruta_logo))[0].replace(" ", "_")
+    ruta_cache = os.path.join(DIRECTORIO_CACHE, f"{nombre_base}_{tamano[0]}x{tamano[1]}.png")
+    if os.path.exists(ruta_cache) and os.path.getmtime(ruta_cache) >= os.path.getmtime(ruta_logo):
+        return tk.PhotoImage(file=ruta_cache)
+
+    from PIL import Image, ImageTk
+    logo = Image.open(ruta_logo).resize(tamano, Image.LANCZOS)
+    try:
+        os.makedirs(DIRECTORIO_CACHE, exist_ok=True)
+        logo.save(ruta_cache)
+    except OSError as e:
+        print(f"No se pudo guardar el logo en caché: {e}")
+    return ImageTk.PhotoImage(logo)
 
 def actualizar_canales_prueba():
     """
@@ -33,7 +113,7 @@ def actualizar_canales_prueba():
         if os.path.exists(directorio_prueba):
             for carpeta in os.listdir(directorio_prueba):
                 ruta_carpeta = os.path.join(directorio_prueba, carpeta)
-                if os.path.isdir(ruta_carpeta) and carpeta.startswith("PT"):
+                if os.path.isdir(ruta_carpeta) and carpeta.lower().startswith("pt"):
                     nuevos_canales.add(carpeta)
     
     # Si hay canales nuevos, actualiza la lista
@@ -55,11 +135,33 @@ def seleccionar_directorio():
         entrada_directorio.insert(0, directorio)
         actualizar_canales_prueba()
 
+def argumentos_plan():
+    """
+    Devuelve las opciones del plan de canales (subconjunto y pares invertidos) para los scripts.
+    Valida antes los canales, ya que un error en el script no se vería en la interfaz.
+
+    Returns:
+    - Lista de argumentos, o None si la lista de canales no es válida (ya se mostró el error).
+    """
+    texto_canales = entrada_canales_plan.get().strip()
+    try:
+        crear_plan(canales_desde_texto(texto_canales), omitir_inversos.get())
+    except ValueError as e:
+        messagebox.showerror("Error", f"Invalid channel list: {e}")
+        return None
+
+    argumentos = []
+    if texto_canales:
+        argumentos += ["--canales", texto_canales]
+    if omitir_inversos.get():
+        argumentos.append("--omitir-inversos")
+    return argumentos
+
 def ejecutar_script():
     """
     Ejecuta el script de adquisición de datos.
     """
-    global proceso
+    global proceso, modo_proceso
     if proceso is None:
         directorio_base = entrada_directorio.get()
         prueba = entrada_prueba.get()
@@ -72,32 +174,73 @@ def ejecutar_script():
             messagebox.showerror("Error", "You must enter the test name.")
             return
 
+        plan = argumentos_plan()
+        if plan is None:
+            return
+
         directorio_prueba = os.path.join(directorio_base, prueba)
         if not os.path.exists(directorio_prueba):
             os.makedirs(directorio_prueba)
 
         # Ejecuta el script como un proceso separado, pasando el threshold como argumento
         proceso = subprocess.Popen(
-            ["python3", "/home/davo/Desktop/VRB/src/adquisicion_datos.py", prueba, directorio_prueba, threshold_temp]
+            ["python3", os.path.join(DIRECTORIO_SRC, "adquisicion_datos.py"), prueba, directorio_base, threshold_temp]
+            + plan
         )
+        modo_proceso = "adquisicion"
         label_estado.config(text="Executing the script...", fg="green")
         ventana.after(1000, verificar_proceso)
     else:
         messagebox.showinfo("Information", "The script is already running.")
 
+def ejecutar_soak():
+    """
+    Ejecuta el modo soak: recorre los canales en ciclo a un voltaje fijo hasta que se detenga.
+    """
+    global proceso, modo_proceso
+    if proceso is not None:
+        messagebox.showinfo("Information", "The script is already running.")
+        return
+
+    directorio_base = entrada_directorio.get()
+    prueba = entrada_prueba.get()
+    if not directorio_base or not os.path.exists(directorio_base):
+        messagebox.showerror("Error", "You must select a valid base directory.")
+        return
+    if not prueba:
+        messagebox.showerror("Error", "You must enter the test name.")
+        return
+    try:
+        float(entrada_voltaje_soak.get())
+    except ValueError:
+        messagebox.showerror("Error", "You must enter a valid soak voltage.")
+        return
+    plan = argumentos_plan()
+    if plan is None:
+        return
+
+    proceso = subprocess.Popen(
+        ["python3", os.path.join(DIRECTORIO_SRC, "monitoreo_soak.py"), prueba, directorio_base,
+         entrada_voltaje_soak.get()] + plan
+    )
+    modo_proceso = "soak"
+    label_estado.config(text="Executing soak...", fg="green")
+    ventana.after(5000, verificar_proceso)
+
 def verificar_proceso():
     """
     Verifica si el proceso sigue ejecutándose y actualiza la interfaz.
     """
     global proceso
-    mostrar_metricas_y_graficas()  # Mostrar métricas parciales
+    actualizar_vista = mostrar_soak if modo_proceso == "soak" else mostrar_metricas_y_graficas
+    actualizar_vista()  # Mostrar resultados parciales
     if proceso and proceso.poll() is None:  # Proceso en ejecución
-        ventana.after(1000, verificar_proceso)
+        ventana.after(5000 if modo_proceso == "soak" else 1000, verificar_proceso)
     else:  # Proceso finalizado
         proceso = None
         label_estado.config(text="Script finished.", fg="red")
         actualizar_canales_prueba()
-        mostrar_metricas_y_graficas()
+        actualizar_vista()
 
 def detener_script():
     """
@@ -112,11 +255,112 @@ def detener_script():
     else:
         messagebox.showinfo("Información", "No script is currently running.")
 
+def generar_reporte():
+    """
+    Genera el reporte consolidado (HTML) de la prueba en un proceso separado.
+    """
+    global proceso_reporte
+    if proceso_reporte is not None:
+        messagebox.showinfo("Information", "The report is already being generated.")
+        return
+
+    directorio_prueba = os.path.join(entrada_directorio.get(), entrada_prueba.get())
+    if not entrada_prueba.get() or not os.path.exists(directorio_prueba):
+        messagebox.showerror("Error", "You must select an existing test.")
+        return
+    try:
+        float(entrada_umbral.get())
+    except ValueError:
+        messagebox.showerror("Error", "You must enter a valid temperature threshold.")
+        return
+
+    proceso_reporte = subprocess.Popen(
+        ["python3", os.path.join(DIRECTORIO_SRC, "reporte.py"), directorio_prueba, entrada_umbral.get()],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    label_estado.config(text=f"Generating report for {entrada_prueba.get()}...", fg="green")
+    ventana.after(1000, verificar_reporte, directorio_prueba)
+
+def verificar_reporte(directorio_prueba):
+    """
+    Verifica si el proceso del reporte terminó y muestra el resultado o el error.
+    """
+    global proceso_reporte
+    if proceso_reporte.poll() is None:  # Proceso en ejecución
+        ventana.after(1000, verificar_reporte, directorio_prueba)
+        return
+
+    _, errores = proceso_reporte.communicate()
+    codigo = proceso_reporte.returncode
+    proceso_reporte = None
+    if codigo == 0:
+        nombre_prueba = os.path.basename(os.path.normpath(directorio_prueba))
+        ruta_reporte = os.path.join(directorio_prueba, f"reporte_{nombre_prueba}.html")
+        label_estado.config(text="Report generated.", fg="green")
+        messagebox.showinfo("Report", f"Report saved to:\n{ruta_reporte}")
+    else:
+        label_estado.config(text="Report failed.", fg="red")
+        detalle = errores.strip().splitlines()[-1] if errores.strip() else f"exit code {codigo}"
+        messagebox.showerror("Error", f"Failed to generate the report: {detalle}")
+
+def obtener_figura_interfaz():
+    """
+    Devuelve la figura integrada en la interfaz, creándola (e importando Matplotlib) en el primer uso.
+    """
+    global canvas_deltas
+    if canvas_deltas is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        canvas_deltas = FigureCanvasTkAgg(Figure(), master=frame_principal)
+        canvas_deltas.get_tk_widget().pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10, pady=10)
+    canvas_deltas.figure.clear()
+    return canvas_deltas.figure
+
+def mostrar_soak():
+    """
+    Grafica la envolvente (mínimo/máximo) del delta de temperatura de cada canal durante el soak,
+    a partir de la vista de tamaño fijo que guarda el script de soak.
+    """
+    global firma_grafica
+    ruta_vista = os.path.join(entrada_directorio.get(), entrada_prueba.get(), "soak", "soak_vista.npz")
+    if not os.path.exists(ruta_vista):
+        return
+
+    # El script de soak reescribe la vista cada pocos minutos: no recargarla si no ha cambiado
+    firma = ("soak", ruta_vista, os.path.getmtime(ruta_vista))
+    if firma == firma_grafica:
+        return
+
+    import numpy as np
+    try:
+        with np.load(ruta_vista) as vista:
+            canales = list(vista["canales"])
+            longitudes = vista["longitudes"]
+            indice_delta = list(vista["magnitudes"]).index("delta_temperatura")
+            tiempo = vista["tiempo"] / 3600
+            minimo = vista["minimo"][:, :, indice_delta]
+            maximo = vista["maximo"][:, :, indice_delta]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"No se pudo leer la vista del soak: {e}")
+        return
+
+    ax = obtener_figura_interfaz().add_subplot(111)
+    for i, canal in enumerate(canales):
+        n = longitudes[i]
+        ax.fill_between(tiempo[i, :n], minimo[i, :n], maximo[i, :n], alpha=0.4, label=canal)
+    ax.set_xlabel("Time (h)")
+    ax.set_ylabel("Delta Temperature (°C)")
+    ax.set_title("Soak: Delta Temperature Envelope per Channel")
+    ax.legend(fontsize=6, ncol=4)
+    ax.grid()
+    canvas_deltas.draw_idle()
+    firma_grafica = firma
+
 def mostrar_metricas_y_graficas():
     """
     Muestra las métricas y llena la tabla de resultados automáticamente.
-    También genera un archivo CSV con todas las temperaturas VRB y deltas de temperatura de todos los canales.
     """
+    global firma_grafica
     directorio_prueba = os.path.join(
         entrada_directorio.get(), entrada_prueba.get()
     )
@@ -125,13 +369,8 @@ def mostrar_metricas_y_graficas():
     for item in tabla_resultados.get_children():
         tabla_resultados.delete(item)
 
-    # Diccionario para almacenar Temperatura VRB y deltas de temperatura
-    datos_combinados = {
-        "Temperatura VRB": []
-    }
-
-    # Lista para almacenar todos los deltas de temperatura
-    todos_los_deltas = []
+    # Archivos de datos de cada canal para la gráfica {canal: ruta_datos_csv}
+    rutas_datos = {}
 
     # Leer métricas de todos los canales y llenar la tabla
     for canal in sorted(canales_actuales, key=lambda x: (x[:3], int(x[3:]))):
@@ -144,90 +383,68 @@ def mostrar_metricas_y_graficas():
 
         # Leer métricas del archivo CSV y llenar la tabla
         try:
-            with open(ruta_metricas_csv, 'r') as archivo_metricas:
-                lineas = archivo_metricas.readlines()
-                promedio_error = float(lineas[0].split(":")[1].strip().replace(',', '').replace('°C', '').strip())
-                promedio_error_abs = float(lineas[1].split(":")[1].strip().replace(',', '').replace('°C', '').strip())
-                error_maximo = float(lineas[2].split(":")[1].strip().replace(',', '').replace('°C', '').strip())
-                desviacion_estandar = float(lineas[3].split(":")[1].strip().replace(',', '').replace('°C', '').strip())
-                error_cuadratico_medio = float(lineas[4].split(":")[1].strip().replace(',', '').replace('°C', '').strip())
-                estado_calidad = lineas[5].split(":")[1].strip()
+            metricas = leer_metricas(ruta_metricas_csv)
+            estado_calidad = metricas["estado_calidad"]
 
             # Insertar los datos en la tabla
-            color = 'green' if estado_calidad.lower() == 'pass' else 'red'
             tabla_resultados.insert("", "end", values=(
-                canal, estado_calidad, error_cuadratico_medio, desviacion_estandar, error_maximo
+                canal, estado_calidad, metricas["error_cuadratico_medio"],
+                metricas["desviacion_estandar"], metricas["error_maximo"]
             ), tags=(estado_calidad,))
             tabla_resultados.tag_configure('Pass', foreground='green')
             tabla_resultados.tag_configure('Fail', foreground='red')
             tabla_resultados.tag_configure('No Pass', foreground='red')
 
-            # Agregar delta_temp al listado de todos los deltas
-            delta_temp = [float(line.strip().split(":")[1]) for line in lineas if "Delta Temperatura" in line]
-            todos_los_deltas.extend(delta_temp)
-
-            # Agregar temperatura VRB y delta al diccionario de datos combinados
-            if "Temperatura VRB" not in datos_combinados or not datos_combinados["Temperatura VRB"]:
-                datos_combinados["Temperatura VRB"] = delta_temp  # Asumiendo que VRB es consistente en cada archivo
-            if len(datos_combinados["Temperatura VRB"]) == 0:
-                datos_combinados["Temperatura VRB"] = delta_temp  # Usar solo la primera columna VRB como referencia
-            else:
-                datos_combinados[canal] = delta_temp if len(delta_temp) == len(datos_combinados["Temperatura VRB"]) else [None] * len(datos_combinados["Temperatura VRB"])
-        
+            ruta_datos_csv = os.path.join(directorio_prueba, canal, f"{canal}_datos.csv")
+            if os.path.exists(ruta_datos_csv):
+                rutas_datos[canal] = ruta_datos_csv
+
         except Exception as e:
             messagebox.showerror("Error", f"Failed to read metrics for channel {canal}: {e}")
             return
 
-    # Guardar los datos combinados en un archivo CSV
-    ruta_csv_combinado = os.path.join(directorio_prueba, "combined_deltas.csv")
-    df_combinado = pd.DataFrame(datos_combinados)
-    df_combinado.to_csv(ruta_csv_combinado, index=False)
-
-    # Guardar los datos combinados en un archivo CSV
-    ruta_csv_combinado = os.path.join(directorio_prueba, "combined_deltas.csv")
-    df_combinado = pd.DataFrame(datos_combinados)
-    df_combinado.to_csv(ruta_csv_combinado, index=False)
-
-    # Graficar todos los deltas de temperatura al finalizar
-    if todos_los_deltas:
-        fig, ax = plt.subplots()
-        ax.plot(todos_los_deltas, label="Delta Temperatures")
-        ax.set_xlabel("Index")
-        ax.set_ylabel("Delta Temperature (°C)")
-        ax.set_title("Delta Temperatures for All Channels")
-        ax.legend()
-        ax.grid()
-
-        # Integrar la gráfica en la interfaz de Tkinter
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-        canvas = FigureCanvasTkAgg(fig, master=frame_principal)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10, pady=10)
+    # Graficar los deltas de temperatura de todos los canales. Un canal tarda más de un minuto en
+    # terminar, así que solo se releen los archivos y se redibuja cuando cambian (canal o fecha)
+    if not rutas_datos:
+        return
+    try:
+        firma = ("deltas", directorio_prueba, tuple((canal, os.path.getmtime(ruta)) for canal, ruta in rutas_datos.items()))
+        if firma == firma_grafica:
+            return
+        deltas_por_canal = {canal: leer_deltas(ruta) for canal, ruta in rutas_datos.items()}
+    except (OSError, ValueError, IndexError) as e:
+        print(f"No se pudieron leer los deltas de temperatura: {e}")
+        return
+
+    ax = obtener_figura_interfaz().add_subplot(111)
+    for canal, (temperaturas_vrb, deltas) in deltas_por_canal.items():
+        ax.plot(temperaturas_vrb, deltas, label=canal, linewidth=0.8)
+    ax.set_xlabel("VRB Temperature (°C)")
+    ax.set_ylabel("Delta Temperature (°C)")
+    ax.set_title("Delta Temperatures for All Channels")
+    ax.legend(fontsize=6, ncol=4)
+    ax.grid()
+    canvas_deltas.draw_idle()
+    firma_grafica = firma
 
 # Configuración de la ventana principal
 ventana = tk.Tk()
 ventana.title("SCB Quality Control")
 ventana.geometry("1200x800")
+registrar_tiempo("ventana")
 
 # Logo en la parte superior izquierda
 frame_logo = tk.Frame(ventana)
 frame_logo.pack(side=tk.TOP, anchor="w", padx=10, pady=10)
 
-# Logo ATLAS
-logo_atlas = Image.open("/home/davo/Desktop/VRB/logo/ATLAS logo default transparent RGBHEX 300ppi.png")  # Ruta al logo de ATLAS
-logo_atlas = logo_atlas.resize((250, 100), Image.LANCZOS)
-logo_atlas_tk = ImageTk.PhotoImage(logo_atlas)
-label_logo_atlas = tk.Label(frame_logo, image=logo_atlas_tk)
-label_logo_atlas.image = logo_atlas_tk
-label_logo_atlas.pack(side=tk.LEFT)
-
-# Logo Universidad
-logo_uni = Image.open("/home/davo/Desktop/VRB/logo/LogoPUJ.png")  # Ruta al logo de la universidad
-logo_uni = logo_uni.resize((100, 100), Image.LANCZOS)
-logo_uni_tk = ImageTk.PhotoImage(logo_uni)
-label_logo_uni = tk.Label(frame_logo, image=logo_uni_tk)
-label_logo_uni.image = logo_uni_tk
-label_logo_uni.pack(side=tk.LEFT, padx=10)
+# Logos (se leen de la caché ya redimensionados)
+for nombre_logo, tamano_logo, separacion in ((LOGO_ATLAS, (250, 100), 0), (LOGO_UNIVERSIDAD, (100, 100), 10)):
+    imagen_logo = cargar_logo(nombre_logo, tamano_logo)
+    if imagen_logo is not None:
+        label_logo = tk.Label(frame_logo, image=imagen_logo)
+        label_logo.image = imagen_logo
+        label_logo.pack(side=tk.LEFT, padx=separacion)
+registrar_tiempo("logos")
 
 # Etiqueta de título
 label_titulo = tk.Label(
@@ -276,6 +493,33 @@ entrada_umbral = tk.Entry(frame_umbral)
 entrada_umbral.insert(0, "2.0")  # Default threshold value
 entrada_umbral.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
+# Entrada para el plan de canales (vacío = todos los canales)
+frame_canales_plan = tk.Frame(frame_parametros)
+frame_canales_plan.pack(pady=5, fill=tk.X)
+
+label_canales_plan = tk.Label(frame_canales_plan, text="Channels to Test:")
+label_canales_plan.pack(side=tk.LEFT, padx=5)
+
+entrada_canales_plan = tk.Entry(frame_canales_plan)
+entrada_canales_plan.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+omitir_inversos = tk.BooleanVar(value=False)
+check_omitir_inversos = tk.Checkbutton(
+    frame_parametros, text="Skip reversed pairs", variable=omitir_inversos
+)
+check_omitir_inversos.pack(pady=5, anchor="w")
+
+# Entrada para el voltaje del modo soak
+frame_voltaje_soak = tk.Frame(frame_parametros)
+frame_voltaje_soak.pack(pady=5, fill=tk.X)
+
+label_voltaje_soak = tk.Label(frame_voltaje_soak, text="Soak Voltage (V):")
+label_voltaje_soak.pack(side=tk.LEFT, padx=5)
+
+entrada_voltaje_soak = tk.Entry(frame_voltaje_soak)
+entrada_voltaje_soak.insert(0, "5.0")  # Default soak voltage
+entrada_voltaje_soak.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
 # Menú desplegable para seleccionar canal
 frame_canales = tk.Frame(frame_parametros)
 frame_canales.pack(pady=5, fill=tk.X)
@@ -305,6 +549,9 @@ explicacion_texto = (
     "Test Name: Name to identify the quality test.\n"
     "Base Directory: Path where the test results will be saved.\n"
     "Temperature Threshold: Limit value for temperature during data acquisition.\n"
+    "Channels to Test: Comma-separated channels in test order (e.g. pta1,ptb1). Empty tests all.\n"
+    "Skip reversed pairs: Do not test s17_s3 when s3_s17 is already in the plan.\n"
+    "Soak Voltage: Fixed voltage for the long-duration soak (stop it with Stop Acquisition).\n"
     "Channel: Select the channel to view the results."
 )
 
@@ -327,6 +574,16 @@ boton_detener = tk.Button(
 )
 boton_detener.pack(side=tk.LEFT, padx=5, pady=5)
 
+boton_reporte = tk.Button(
+    frame_botones, text="Generate Report", command=generar_reporte, font=("Open Sans", 12)
+)
+boton_reporte.pack(side=tk.LEFT, padx=5, pady=5)
+
+boton_soak = tk.Button(
+    frame_botones, text="Start Soak", command=ejecutar_soak, font=("Open Sans", 12)
+)
+boton_soak.pack(side=tk.LEFT, padx=5, pady=5)
+
 # Estado del proceso
 label_estado = tk.Label(ventana, text="Status: Inactive", font=("Open Sans", 12), fg="red")
 label_estado.pack(pady=10)
@@ -356,5 +613,10 @@ style.map('Custom.Treeview',
            background=[('selected', '#4caf50')],
            foreground=[('selected', 'white')])
 
+registrar_tiempo("widgets")
+if REGISTRAR_ARRANQUE:
+    ventana.after_idle(reportar_tiempos_arranque)
+
 # Inicia el bucle principal de la interfaz
-ventana.mainloop()
+if __name__ == "__main__":
+    ventana.mainloop()
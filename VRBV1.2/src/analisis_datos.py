@@ -13,9 +13,41 @@ import csv
 import numpy as np
 import math
 import pandas as pd
+from resultados_canal import escribir_metricas
+
+# Claves del diccionario de datos que el script de adquisición entrega a procesar_y_guardar_datos
+CLAVES_SERIES = ["voltajes", "corrientes", "voltajes_scb", "temperaturas_scb", "temperaturas_vrb"]
+CLAVES_DATOS = CLAVES_SERIES + ["threshold_temp"]
+
+def crear_datos(voltajes, corrientes, voltajes_scb, temperaturas_scb, temperaturas_vrb, threshold_temp):
+    """
+    Construye el diccionario de datos de un canal con las claves que espera procesar_y_guardar_datos.
+    """
+    return {
+        "voltajes": voltajes,
+        "corrientes": corrientes,
+        "voltajes_scb": voltajes_scb,
+        "temperaturas_scb": temperaturas_scb,
+        "temperaturas_vrb": temperaturas_vrb,
+        "threshold_temp": threshold_temp,
+    }
+
+def validar_datos(datos):
+    """
+    Verifica que el diccionario de datos tenga todas las claves y que las series tengan la misma longitud.
+    Lanza ValueError si no cumple el contrato.
+    """
+    faltantes = [clave for clave in CLAVES_DATOS if clave not in datos]
+    if faltantes:
+        raise ValueError(f"Faltan claves en los datos: {', '.join(faltantes)}")
+    longitudes = {clave: len(datos[clave]) for clave in CLAVES_SERIES}
+    if len(set(longitudes.values())) != 1:
+        raise ValueError(f"Las series de datos tienen longitudes distintas: {longitudes}")
+    if longitudes["voltajes"] == 0:
+        raise ValueError("Los datos no contienen mediciones")
 
 def validar_canal(delta_temperaturas, threshold_temp):
- """
+    """
     Valida el canal basado en el error RMS y un umbral.
 
     Parameters:
@@ -44,6 +76,7 @@ def procesar_y_guardar_datos(datos, directorio_canal, canal_descriptivo, temp_th
     - directorio_base_csv: Ruta base para el archivo combinado de deltas.
 
     """
+    validar_datos(datos)
     if not os.path.exists(directorio_canal):
         os.makedirs(directorio_canal)
 
@@ -54,8 +87,8 @@ def procesar_y_guardar_datos(datos, directorio_canal, canal_descriptivo, temp_th
 
     # Cálculo del delta de temperatura
     for voltaje, corriente, voltaje_scb, temp_scb, temp_vrb in zip(
-        datos["voltajes"], datos["corrientes"], datos["voltaje_scb"],
-        datos["temperatura_scb"], datos["temperatura_vrb"]
+        datos["voltajes"], datos["corrientes"], datos["voltajes_scb"],
+        datos["temperaturas_scb"], datos["temperaturas_vrb"]
     ):
         delta_t = temp_vrb - temp_scb  # Calcular delta de temperatura
         delta_temp.append(delta_t)
@@ -82,13 +115,10 @@ def procesar_y_guardar_datos(datos, directorio_canal, canal_descriptivo, temp_th
     nombre_archivo_metricas = os.path.join(
      directorio_canal, f"{canal_descriptivo}_metricas.csv"
     )
-    with open(nombre_archivo_metricas, mode='w') as archivo_metricas:
-        archivo_metricas.write(f"Promedio del Error: {promedio_error:.3f} °C\n")
-        archivo_metricas.write(f"Promedio Absoluto del Error: {promedio_error_abs:.3f} °C\n")
-        archivo_metricas.write(f"Error Máximo: {error_maximo:.3f} °C\n")
-        archivo_metricas.write(f"Desviación Estándar del Error: {desviacion_estandar:.3f} °C\n")
-        archivo_metricas.write(f"Error Cuadrático Medio (RMSD): {error_cuadratico_medio:.3f} °C\n")
-        archivo_metricas.write(f"Estado de Calidad del Canal: {'Pass' if validar_canal(delta_temp, datos['threshold_temp']) else 'No Pass'}\n")
+    escribir_metricas(
+        nombre_archivo_metricas, promedio_error, promedio_error_abs, error_maximo,
+        desviacion_estandar, error_cuadratico_medio, validar_canal(delta_temp, datos['threshold_temp'])
+    )
 
     # Guardar los datos en un archivo CSV
     nombre_archivo_csv = os.path.join(directorio_canal, f"{canal_descriptivo}_datos.csv")
@@ -99,24 +129,16 @@ def procesar_y_guardar_datos(datos, directorio_canal, canal_descriptivo, temp_th
             "Temperatura SCB (°C)", "Temperatura VRB (°C)", "Delta Temperatura (°C)"
         ])
         for voltaje, corriente, voltaje_scb, temp_scb, temp_vrb, delta_t in zip(
-            datos["voltajes"], datos["corrientes"], datos["voltaje_scb"],
-            datos["temperatura_scb"], datos["temperatura_vrb"], delta_temp
+            datos["voltajes"], datos["corrientes"], datos["voltajes_scb"],
+            datos["temperaturas_scb"], datos["temperaturas_vrb"], delta_temp
         ):
             writer.writerow([voltaje, corriente, voltaje_scb, temp_scb, temp_vrb, delta_t])
 
     # Guardar delta y temperatura VRB en un archivo CSV combinado
-    ruta_csv_combinado = os.path.join(directorio_base_csv, "combined_deltas.csv")
-    if not os.path.exists(ruta_csv_combinado):
-        with open(ruta_csv_combinado, mode='w', newline='') as archivo_csv:
-            writer = csv.writer(archivo_csv)
-            writer.writerow(["Temperatura VRB"] + [canal_descriptivo])
-        for temp_vrb, delta_t in zip(datos["temperatura_vrb"], delta_temp):
-            writer.writerow([temp_vrb, delta_t])
-    else:
-    # Si el archivo ya existe, agregar una nueva columna con el delta del nuevo canal
-        df = pd.read_csv(ruta_csv_combinado)
-        df[canal_descriptivo] = delta_temp
-        df.to_csv(ruta_csv_combinado, index=False)
+    guardar_csv_combinado(
+        os.path.join(directorio_base_csv, "combined_deltas.csv"), canal_descriptivo,
+        datos["temperaturas_vrb"], delta_temp
+    )
 
     # Generar gráficas
     generar_graficas(datos, delta_temp, directorio_canal, canal_descriptivo)
@@ -124,6 +146,33 @@ def procesar_y_guardar_datos(datos, directorio_canal, canal_descriptivo, temp_th
     print(f"Datos, gráficas y métricas guardados para {canal_descriptivo} en {directorio_canal}")
 
 
+def guardar_csv_combinado(ruta_csv_combinado, canal_descriptivo, temperaturas_vrb, delta_temp):
+    """
+    Agrega la columna de deltas del canal al archivo combinado de la prueba.
+    La primera columna es la Temperatura VRB del primer canal guardado; si los canales
+    tienen distinto número de puntos, las celdas faltantes quedan vacías.
+
+    Parameters:
+    - ruta_csv_combinado: Ruta del archivo combined_deltas.csv.
+    - canal_descriptivo: Nombre de la columna del canal.
+    - temperaturas_vrb: Temperaturas VRB del canal.
+    - delta_temp: Deltas de temperatura (VRB - SCB) del canal.
+    """
+    columna = pd.Series(np.asarray(delta_temp, dtype=float), name=canal_descriptivo)
+    if not os.path.exists(ruta_csv_combinado):
+        df = pd.DataFrame({
+            "Temperatura VRB": pd.Series(np.asarray(temperaturas_vrb, dtype=float)),
+            canal_descriptivo: columna,
+        })
+    else:
+        # Si el archivo ya existe, agregar (o reemplazar) la columna del nuevo canal
+        df = pd.read_csv(ruta_csv_combinado)
+        if len(columna) > len(df):
+            df = df.reindex(range(len(columna)))
+        df[canal_descriptivo] = columna
+    df.to_csv(ruta_csv_combinado, index=False)
+
+
 def generar_graficas(datos, delta_temp, directorio_canal, canal_descriptivo):
     """
     Genera las gráficas de los datos y las guarda en el directorio correspondiente.
@@ -135,8 +184,8 @@ def generar_graficas(datos, delta_temp, directorio_canal, canal_descriptivo):
     """
     # Gráfica de Temperatura SCB y VRB vs Voltaje SCB
     plt.figure()
-    plt.plot(datos["voltaje_scb"], datos["temperatura_scb"], label="Temperatura SCB")
-    plt.plot(datos["voltaje_scb"], datos["temperatura_vrb"], label="Temperatura VRB")
+    plt.plot(datos["voltajes_scb"], datos["temperaturas_scb"], label="Temperatura SCB")
+    plt.plot(datos["voltajes_scb"], datos["temperaturas_vrb"], label="Temperatura VRB")
     plt.xlabel("Voltaje SCB (V)")
     plt.ylabel("Temperatura (°C)")
     plt.title(f"Temperatura SCB y VRB vs Voltaje SCB para {canal_descriptivo}")
@@ -148,10 +197,10 @@ def generar_graficas(datos, delta_temp, directorio_canal, canal_descriptivo):
     )
     plt.savefig(nombre_imagen_combinada)
     plt.close()
-<
+
     # Gráfica del delta de temperatura vs temperatura VRB
     plt.figure()
-    plt.plot(datos["temperatura_vrb"], delta_temp, label="Delta de Temperatura (VRB - SCB)")
+    plt.plot(datos["temperaturas_vrb"], delta_temp, label="Delta de Temperatura (VRB - SCB)")
     plt.xlabel("Temperatura VRB (°C)")
     plt.ylabel("Δ Temperatura (°C)")
     plt.title(f"Δ Temperatura vs Temperatura VRB para {canal_descriptivo}")
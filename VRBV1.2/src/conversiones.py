@@ -0,0 +1,60 @@
+"""
+Funciones de conversión de las mediciones (corriente, resistencia) a temperatura.
+No dependen de los instrumentos ni del GPIO, por lo que pueden usarse y medirse
+fuera de la Raspberry Pi.
+
+Autor: Diego Alejandro Vera Ortega
+Fecha: 18/11/2024
+"""
+
+import numpy as np
+
+def corriente_a_temperatura(corriente):
+    """
+    Calcula la resistencia VRB a partir de la corriente medida.
+    """
+    resistencia = (1000 * 0.79932) / corriente * 1000
+    return resistencia
+
+def convertir_resistencia_a_temperatura(resistencia):
+    """
+    Convierte una resistencia medida en temperatura usando una ecuación de transferencia.
+    """
+    if resistencia > 10e3:
+        temperatura = ((-24536.24) + (0.02350289 * resistencia * 100) +
+                       (0.000000001034084 * (resistencia * 100) ** 2)) / 100
+    else:
+        temperatura = ((-24564.58) + (0.02353718 * resistencia * 100) +
+                       (0.000000001027502 * (resistencia * 100) ** 2)) / 100
+    return temperatura
+
+def temperature(r_scb):
+    """
+    Calcula la temperatura a partir de la resistencia r_scb usando la ecuación proporcionada.
+    """
+    a = 3.9083e-3
+    b = -5.775e-7
+    c = -4.183e-12
+    r0 = 10000  # Resistencia base en ohmios
+
+    if r_scb < r0:
+        # Resolver ecuación de cuarto grado
+        c4 = c * r0
+        c3 = -c * r0 * 100
+        c2 = b * r0
+        c1 = a * r0
+        c0 = r0 - r_scb
+        coeficientes = [c4, c3, c2, c1, c0]
+    else:
+        # Resolver ecuación de segundo grado
+        c2 = b * r0
+        c1 = a * r0
+        c0 = r0 - r_scb
+        coeficientes = [c2, c1, c0]
+
+    # Encontrar las raíces reales del polinomio
+    raices = np.roots(coeficientes)
+    raices_reales = [r for r in raices if np.isreal(r)]
+
+    # Retornar la raíz física (temperatura), usualmente la más baja
+    return np.real(raices_reales[1]) if raices_reales else None
@@ -0,0 +1,312 @@
+"""
+Script para el modo soak (burn-in): recorre indefinidamente los canales del
+multiplexor a un voltaje fijo, guardando las muestras en archivos CSV por bloques
+con rotación y manteniendo un buffer circular de tamaño fijo por canal
+(decimado en mínimo/máximo) para la visualización en vivo.
+El uso de memoria es constante sin importar la duración de la prueba.
+
+Uso: python3 monitoreo_soak.py <nombre_prueba> <directorio_base> <voltaje> [duracion_horas]
+     [--canales pta1,ptb1,...] [--omitir-inversos] [--verificar] [--tiempo-espera 1.5]
+     [--filas-por-archivo 10000] [--max-archivos N] [--capacidad-buffer 2000] [--factor-decimacion 4]
+     [--intervalo-vista 300]
+
+Autor: Diego Alejandro Vera Ortega
+Fecha: 18/11/2024
+"""
+
+import os
+import csv
+import argparse
+import json
+import time
+import signal
+import itertools
+import numpy as np
+from plan_canales import PlanCanales
+
+COLUMNAS_SOAK = [
+    "Tiempo (s)", "Canal", "Corriente (µA)", "Voltaje SCB (V)",
+    "Temperatura SCB (°C)", "Temperatura VRB (°C)", "Delta Temperatura (°C)"
+]
+MAGNITUDES_VISTA = ["temperatura_scb", "temperatura_vrb", "delta_temperatura"]
+NOMBRE_ARCHIVO_VISTA = "soak_vista.npz"
+
+
+class BufferCircular:
+    """
+    Buffer circular de tamaño fijo con decimación mínimo/máximo.
+
+    Cada posición del buffer resume `factor_decimacion` muestras consecutivas
+    guardando su mínimo y su máximo, de modo que la envolvente de la señal se
+    conserva aunque se descarten muestras. Al llenarse se sobrescriben los
+    bloques más antiguos. El bloque en curso (incompleto) también se incluye en
+    datos(), para que la vista en vivo muestre cada muestra desde el primer ciclo.
+    """
+
+    def __init__(self, capacidad, magnitudes, factor_decimacion=1):
+        if capacidad < 1 or factor_decimacion < 1:
+            raise ValueError("La capacidad y el factor de decimación deben ser mayores a cero")
+        self.capacidad = capacidad
+        self.factor_decimacion = factor_decimacion
+        self.tiempo = np.full(capacidad, np.nan)
+        self.minimo = np.full((capacidad, magnitudes), np.nan)
+        self.maximo = np.full((capacidad, magnitudes), np.nan)
+        self.posicion = 0
+        self.llenos = 0
+        self._bloque_min = np.full(magnitudes, np.inf)
+        self._bloque_max = np.full(magnitudes, -np.inf)
+        self._bloque_muestras = 0
+        self._bloque_tiempo = np.nan
+
+    def agregar(self, tiempo, valores):
+        """
+        Agrega una muestra (tiempo y un valor por magnitud) al bloque en curso.
+        """
+        valores = np.asarray(valores, dtype=float)
+        np.fmin(self._bloque_min, valores, out=self._bloque_min)
+        np.fmax(self._bloque_max, valores, out=self._bloque_max)
+        self._bloque_muestras += 1
+        self._bloque_tiempo = tiempo
+
+        if self._bloque_muestras >= self.factor_decimacion:
+            self.tiempo[self.posicion] = tiempo
+            self.minimo[self.posicion] = self._bloque_min
+            self.maximo[self.posicion] = self._bloque_max
+            self.posicion = (self.posicion + 1) % self.capacidad
+            self.llenos = min(self.llenos + 1, self.capacidad)
+            self._bloque_min.fill(np.inf)
+            self._bloque_max.fill(-np.inf)
+            self._bloque_muestras = 0
+
+    def datos(self):
+        """
+        Devuelve (tiempo, minimo, maximo) ordenados del bloque más antiguo al más reciente,
+        incluyendo al final el bloque en curso si tiene muestras. El bloque más antiguo se
+        omite cuando el buffer está lleno, para no superar `capacidad` filas.
+        """
+        inicio = self.posicion if self.llenos == self.capacidad else 0
+        indices = (np.arange(self.llenos) + inicio) % self.capacidad
+        tiempo, minimo, maximo = self.tiempo[indices], self.minimo[indices], self.maximo[indices]
+        if self._bloque_muestras == 0:
+            return tiempo, minimo, maximo
+
+        if self.llenos == self.capacidad:
+            tiempo, minimo, maximo = tiempo[1:], minimo[1:], maximo[1:]
+        return (
+            np.append(tiempo, self._bloque_tiempo),
+            np.vstack([minimo, self._bloque_min]),
+            np.vstack([maximo, self._bloque_max]),
+        )
+
+
+class EscritorRotativo:
+    """
+    Escribe filas CSV en archivos por bloques (prefijo_00001.csv, prefijo_00002.csv, ...),
+    abriendo un archivo nuevo cada `filas_por_archivo` filas. Si se define `max_archivos`,
+    se borran los bloques más antiguos para acotar también el uso de disco.
+    """
+
+    def __init__(self, directorio, prefijo, encabezado, filas_por_archivo=10000, max_archivos=None):
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.prefijo = prefijo
+        self.encabezado = encabezado
+        self.filas_por_archivo = filas_por_archivo
+        self.max_archivos = max_archivos
+        self.numero_archivo = 0
+        self.filas_archivo = 0
+        self.archivo = None
+        self.writer = None
+
+    def _ruta(self, numero):
+        return os.path.join(self.directorio, f"{self.prefijo}_{numero:05d}.csv")
+
+    def _rotar(self):
+        self.cerrar()
+        self.numero_archivo += 1
+        self.archivo = open(self._ruta(self.numero_archivo), mode='w', newline='')
+        self.writer = csv.writer(self.archivo)
+        self.writer.writerow(self.encabezado)
+        self.filas_archivo = 0
+
+        if self.max_archivos is not None:
+            ruta_antigua = self._ruta(self.numero_archivo - self.max_archivos)
+            if os.path.exists(ruta_antigua):
+                os.remove(ruta_antigua)
+
+    def escribir(self, fila):
+        if self.writer is None or self.filas_archivo >= self.filas_por_archivo:
+            self._rotar()
+        self.writer.writerow(fila)
+        self.filas_archivo += 1
+
+    def vaciar(self):
+        if self.archivo is not None:
+            self.archivo.flush()
+
+    def cerrar(self):
+        if self.archivo is not None:
+            self.archivo.close()
+            self.archivo = None
+            self.writer = None
+
+
+def guardar_vista(ruta, buffers):
+    """
+    Guarda el contenido de los buffers circulares en un archivo .npz para la interfaz gráfica.
+    Solo se escribe la parte llena (hasta el canal con más posiciones, en float32) junto con
+    la longitud de cada canal, para no reescribir el relleno vacío en la tarjeta SD.
+    El archivo se reemplaza de forma atómica para que nunca se lea a medio escribir.
+    """
+    canales = list(buffers)
+    contenido = [buffers[canal].datos() for canal in canales]
+    longitudes = np.array([len(t) for t, _, _ in contenido], dtype=np.int32)
+    longitud = int(longitudes.max()) if len(longitudes) else 0
+    magnitudes = len(MAGNITUDES_VISTA)
+    tiempo = np.full((len(canales), longitud), np.nan, dtype=np.float32)
+    minimo = np.full((len(canales), longitud, magnitudes), np.nan, dtype=np.float32)
+    maximo = np.full((len(canales), longitud, magnitudes), np.nan, dtype=np.float32)
+
+    for i, (t, mn, mx) in enumerate(contenido):
+        tiempo[i, :len(t)] = t
+        minimo[i, :len(t)] = mn
+        maximo[i, :len(t)] = mx
+
+    ruta_temporal = ruta + ".tmp.npz"
+    np.savez(
+        ruta_temporal, canales=np.array(canales), magnitudes=np.array(MAGNITUDES_VISTA),
+        longitudes=longitudes, tiempo=tiempo, minimo=minimo, maximo=maximo
+    )
+    os.replace(ruta_temporal, ruta)
+
+
+def monitoreo_soak(
+    amperimetro, voltimetro, fuente, plan, directorio_soak, voltaje,
+    tiempo_espera=1.5, duracion=None, capacidad_buffer=2000, factor_decimacion=4,
+    filas_por_archivo=10000, max_archivos=None, intervalo_vista=300, rv=1000, vref=0.79932, verificar=False
+):
+    """
+    Recorre los canales del multiplexor en ciclo a un voltaje fijo hasta completar la duración
+    indicada (o indefinidamente si es None), o hasta recibir SIGTERM/SIGINT.
+
+    Parameters:
+    - plan: PlanCanales con los canales a recorrer y su orden.
+    - directorio_soak: Ruta donde guardar los bloques CSV y la vista para la interfaz.
+    - voltaje: Voltaje fijo de la fuente (V).
+    - tiempo_espera: Tiempo de estabilización tras cambiar de canal (s).
+    - duracion: Duración máxima del soak en segundos.
+    - capacidad_buffer, factor_decimacion: Tamaño del buffer circular por canal y muestras por bloque.
+      Cada canal recibe una muestra por ciclo (~36 s con 24 canales), así que con los valores por
+      defecto la vista cubre unas 80 horas.
+    - filas_por_archivo, max_archivos: Rotación de los archivos CSV.
+    - intervalo_vista: Tiempo mínimo entre escrituras de la vista para la interfaz (s). La vista se
+      guarda siempre tras el primer ciclo y al terminar.
+    - verificar: Releer los pines de dirección tras cada cambio de canal.
+    """
+    from adquisicion_datos import GPIO, medir_muestra
+
+    os.makedirs(directorio_soak, exist_ok=True)
+    buffers = {
+        canal: BufferCircular(capacidad_buffer, len(MAGNITUDES_VISTA), factor_decimacion)
+        for canal in plan.nombres()
+    }
+    escritor = EscritorRotativo(directorio_soak, "soak", COLUMNAS_SOAK, filas_por_archivo, max_archivos)
+    ruta_vista = os.path.join(directorio_soak, NOMBRE_ARCHIVO_VISTA)
+
+    with open(os.path.join(directorio_soak, "parametros_soak.json"), mode='w') as archivo_parametros:
+        json.dump({
+            "fecha": time.strftime("%Y-%m-%d %H:%M:%S"), "voltaje": voltaje,
+            "tiempo_espera": tiempo_espera, "duracion": duracion,
+            "capacidad_buffer": capacidad_buffer, "factor_decimacion": factor_decimacion,
+            "filas_por_archivo": filas_por_archivo, "max_archivos": max_archivos,
+            "intervalo_vista": intervalo_vista,
+            "canales": plan.nombres(), "rv": rv, "vref": vref,
+        }, archivo_parametros, indent=2)
+
+    # La interfaz detiene el proceso con terminate() (SIGTERM): terminar el ciclo en curso y cerrar ordenadamente
+    detener = []
+    signal.signal(signal.SIGTERM, lambda *_: detener.append(True))
+
+    fuente.write("INST:SEL CH1")
+    fuente.write(f"VOLT {voltaje}")
+    fuente.write("OUTP ON")
+
+    tiempo_inicio = time.time()
+    tiempo_vista = None
+    try:
+        for ciclo in itertools.count(1):
+            for canal_plan in plan:
+                if detener or (duracion is not None and time.time() - tiempo_inicio >= duracion):
+                    return
+
+                canal = canal_plan.nombre
+                PlanCanales.seleccionar(GPIO, canal_plan, verificar)
+                time.sleep(tiempo_espera)
+
+                try:
+                    corriente, voltaje_scb, temperatura_vrb, temperatura_scb = medir_muestra(
+                        amperimetro, voltimetro, rv, vref
+                    )
+                    delta_t = temperatura_vrb - temperatura_scb
+                except Exception as e:
+                    print(f"Error al medir corriente o voltaje en {canal}: {e}")
+                    continue
+
+                tiempo_muestra = time.time() - tiempo_inicio
+                escritor.escribir([
+                    f"{tiempo_muestra:.3f}", canal, corriente, voltaje_scb,
+                    temperatura_scb, temperatura_vrb, delta_t
+                ])
+                buffers[canal].agregar(tiempo_muestra, (temperatura_scb, temperatura_vrb, delta_t))
+
+            escritor.vaciar()
+            if tiempo_vista is None or time.time() - tiempo_vista >= intervalo_vista:
+                guardar_vista(ruta_vista, buffers)
+                tiempo_vista = time.time()
+            print(f"Ciclo {ciclo} completado ({time.time() - tiempo_inicio:.0f} s)")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        escritor.cerrar()
+        guardar_vista(ruta_vista, buffers)
+        fuente.write("INST:SEL CH1")
+        fuente.write("OUTP OFF")
+        GPIO.cleanup()
+        print(f"Soak finalizado tras {time.time() - tiempo_inicio:.0f} segundos")
+
+
+if __name__ == "__main__":
+    from adquisicion_datos import (
+        agregar_argumentos_plan, configurar_gpio, inicializar_instrumentos, plan_desde_argumentos
+    )
+
+    parser = argparse.ArgumentParser(description="Modo soak (burn-in) a voltaje fijo")
+    parser.add_argument("nombre_prueba")
+    parser.add_argument("directorio_base")
+    parser.add_argument("voltaje", type=float)
+    parser.add_argument("duracion_horas", type=float, nargs="?")
+    agregar_argumentos_plan(parser)
+    parser.add_argument("--tiempo-espera", type=float, default=1.5, help="Estabilización tras cambiar de canal (s)")
+    parser.add_argument("--filas-por-archivo", type=int, default=10000, help="Filas de cada bloque CSV")
+    parser.add_argument("--max-archivos", type=int,
+                        help="Bloques CSV a conservar; los más antiguos se borran (por defecto se conservan todos)")
+    parser.add_argument("--capacidad-buffer", type=int, default=2000, help="Posiciones de la vista en vivo por canal")
+    parser.add_argument("--factor-decimacion", type=int, default=4, help="Muestras resumidas en cada posición")
+    parser.add_argument("--intervalo-vista", type=float, default=300,
+                        help="Tiempo mínimo entre escrituras de la vista en vivo (s)")
+    argumentos = parser.parse_args()
+
+    duracion = argumentos.duracion_horas * 3600 if argumentos.duracion_horas is not None else None
+    plan = plan_desde_argumentos(argumentos)
+
+    fuente, amperimetro, voltimetro = inicializar_instrumentos()
+    configurar_gpio()
+
+    monitoreo_soak(
+        amperimetro, voltimetro, fuente, plan,
+        os.path.join(argumentos.directorio_base, argumentos.nombre_prueba, "soak"), argumentos.voltaje,
+        tiempo_espera=argumentos.tiempo_espera, duracion=duracion,
+        capacidad_buffer=argumentos.capacidad_buffer, factor_decimacion=argumentos.factor_decimacion,
+        filas_por_archivo=argumentos.filas_por_archivo, max_archivos=argumentos.max_archivos,
+        intervalo_vista=argumentos.intervalo_vista, verificar=argumentos.verificar
+    )
@@ -0,0 +1,148 @@
+"""
+Plan de prueba de los canales del multiplexor ADG732. Precalcula, para cada canal,
+los pines y niveles de dirección de ambos multiplexores, de modo que el cambio de
+canal se hace con una sola escritura GPIO en bloque. Permite elegir un subconjunto
+de canales, su orden y omitir los pares invertidos.
+
+Autor: Diego Alejandro Vera Ortega
+Fecha: 18/11/2024
+"""
+
+from collections import namedtuple
+
+# Pines GPIO (numeración BOARD) de dirección de cada multiplexor, del bit más significativo al menos
+gpio_a_pins = [10, 8, 7, 5, 3]
+gpio_a_pins_mux2 = [29, 31, 33, 35, 37]
+
+# Mapeos de canales
+canal_a_binario = {
+    "s3": "00010", "s4": "00011", "s5": "00100", "s6": "00101", "s7": "00110",
+    "s8": "00111", "s9": "01000", "s10": "01001", "s11": "01010", "s12": "01011",
+    "s13": "01100", "s14": "01101", "s28": "11011", "s27": "11010", "s26": "11001",
+    "s25": "11000", "s24": "10111", "s23": "10110", "s22": "10101", "s21": "10100",
+    "s20": "10011", "s19": "10010", "s18": "10001", "s17": "10000"
+}
+canal_a_binario_mux2 = canal_a_binario.copy()
+
+mapeo_sincronizado = {
+    "s3": "s17", "s4": "s18", "s5": "s19", "s6": "s20", "s7": "s21",
+    "s8": "s22", "s9": "s23", "s10": "s24", "s11": "s25", "s12": "s26",
+    "s13": "s27", "s14": "s28", "s28": "s14", "s27": "s13", "s26": "s12",
+    "s25": "s11", "s24": "s10", "s23": "s9", "s22": "s8", "s21": "s7",
+    "s20": "s6", "s19": "s5", "s18": "s4", "s17": "s3"
+}
+
+nombre_canal = {
+    "s3_s17": "pta1", "s4_s18": "ptb1", "s5_s19": "pta2", "s6_s20": "ptb2",
+    "s7_s21": "pta3", "s8_s22": "ptb3", "s9_s23": "pta4", "s10_s24": "ptb4",
+    "s11_s25": "pta5", "s12_s26": "ptb5", "s13_s27": "pta6", "s14_s28": "ptb6",
+    "s28_s14": "pta7", "s27_s13": "ptb7", "s26_s12": "pta8", "s25_s11": "ptb8",
+    "s24_s10": "pta9", "s23_s9": "ptb9", "s22_s8": "pta10", "s21_s7": "ptb10",
+    "s20_s6": "pta11", "s19_s5": "ptb11", "s18_s4": "pta12", "s17_s3": "ptb12"
+}
+
+
+def direccion_binaria(binario):
+    """
+    Convierte una dirección binaria en texto ("00010") en una tupla de niveles (0, 0, 0, 1, 0).
+    """
+    return tuple(int(bit) for bit in binario)
+
+
+# Canal del plan de prueba con su dirección ya resuelta a nivel de pines
+CanalPlan = namedtuple("CanalPlan", ["nombre", "switch_mux1", "switch_mux2", "pines", "valores"])
+
+
+class PlanCanales:
+    """
+    Lista ordenada de canales a recorrer, con las direcciones de MUX1 y MUX2 precalculadas.
+
+    Parameters:
+    - pines_mux1, pines_mux2: Pines GPIO de dirección de cada multiplexor (del bit más significativo al menos).
+    - canales: Nombres descriptivos ("pta1") o pares "s3_s17", en el orden deseado. None recorre todos.
+    - omitir_inversos: Si es True, no se recorre el par s17_s3 cuando ya está s3_s17 en el plan.
+      Un canal repetido en `canales` lanza ValueError, igual que un canal desconocido.
+    - mapeo: Diccionario {entrada MUX1: entrada MUX2} con los pares disponibles.
+    """
+
+    def __init__(self, pines_mux1, pines_mux2, canales=None, omitir_inversos=False, mapeo=None):
+        mapeo = mapeo_sincronizado if mapeo is None else mapeo
+        pares = {}
+        for switch_mux1, switch_mux2 in mapeo.items():
+            par = f"{switch_mux1}_{switch_mux2}"
+            pares[par] = (nombre_canal.get(par, par), switch_mux1, switch_mux2)
+        por_nombre = {nombre: par for par, (nombre, _, _) in pares.items()}
+
+        if canales is None:
+            seleccion = list(pares)
+        else:
+            seleccion = []
+            for canal in canales:
+                par = canal if canal in pares else por_nombre.get(canal.lower())
+                if par is None:
+                    raise ValueError(f"Canal desconocido: {canal}")
+                seleccion.append(par)
+
+        self.pines = tuple(pines_mux1) + tuple(pines_mux2)
+        self.canales = []
+        vistos = set()
+        for par in seleccion:
+            nombre, switch_mux1, switch_mux2 = pares[par]
+            if (switch_mux1, switch_mux2) in vistos:
+                raise ValueError(f"Canal repetido: {nombre}")
+            if omitir_inversos and (switch_mux2, switch_mux1) in vistos:
+                continue
+            vistos.add((switch_mux1, switch_mux2))
+            valores = (
+                direccion_binaria(canal_a_binario[switch_mux1])
+                + direccion_binaria(canal_a_binario_mux2[switch_mux2])
+            )
+            if len(valores) != len(self.pines):
+                raise ValueError(f"La dirección de {nombre} no coincide con el número de pines")
+            self.canales.append(CanalPlan(nombre, switch_mux1, switch_mux2, self.pines, valores))
+
+    def __iter__(self):
+        return iter(self.canales)
+
+    def __len__(self):
+        return len(self.canales)
+
+    def nombres(self):
+        return [canal.nombre for canal in self.canales]
+
+    @staticmethod
+    def seleccionar(gpio, canal, verificar=False):
+        """
+        Selecciona el canal en ambos multiplexores con una sola escritura GPIO en bloque.
+
+        Parameters:
+        - gpio: Módulo GPIO (RPi.GPIO o compatible, con output/input sobre listas de pines).
+        - canal: CanalPlan a seleccionar.
+        - verificar: Si es True, relee los pines y lanza RuntimeError si no coinciden.
+        """
+        gpio.output(canal.pines, canal.valores)
+        if verificar:
+            leidos = tuple(int(gpio.input(pin)) for pin in canal.pines)
+            if leidos != canal.valores:
+                raise RuntimeError(
+                    f"Dirección incorrecta para {canal.nombre}: esperado {canal.valores}, leído {leidos}"
+                )
+
+
+def canales_desde_texto(texto):
+    """
+    Convierte una lista de canales separada por comas ("pta1, ptb1,s5_s19") en una lista de nombres.
+
+    Returns:
+    - Lista de canales, o None si el texto no tiene canales (se recorren todos).
+    """
+    canales = [canal.strip() for canal in (texto or "").split(",") if canal.strip()]
+    return canales or None
+
+
+def crear_plan(canales=None, omitir_inversos=False):
+    """
+    Crea el plan de canales con los pines de dirección de ambos multiplexores.
+    Lanza ValueError si hay un canal desconocido o repetido.
+    """
+    return PlanCanales(gpio_a_pins, gpio_a_pins_mux2, canales, omitir_inversos)
@@ -0,0 +1,279 @@
+"""
+Script para generar un reporte consolidado de la tarjeta (SCB) a partir de los
+resultados numéricos guardados por canal. Produce un único documento HTML o PDF
+con la tabla resumen, la cuadrícula de gráficas de todos los canales,
+el estado Pass/No Pass y los parámetros de la prueba.
+
+Uso: python3 reporte.py <directorio_prueba> [temp_threshold] [html|pdf]
+
+Autor: Diego Alejandro Vera Ortega
+Fecha: 18/11/2024
+"""
+
+import os
+import re
+import sys
+import csv
+import io
+import json
+import base64
+import html
+import math
+import time
+import textwrap
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+NOMBRE_ARCHIVO_PARAMETROS = "parametros_prueba.json"
+COLOR_PASS = "#c8e6c9"
+COLOR_NO_PASS = "#ffcdd2"
+
+
+def clave_orden_canal(canal):
+    """
+    Ordena los canales por prefijo y número (pta1, pta2, ..., ptb1, ...).
+    """
+    coincidencia = re.match(r"([^\d]*)(\d+)$", canal)
+    if coincidencia:
+        return (coincidencia.group(1).lower(), int(coincidencia.group(2)))
+    return (canal.lower(), 0)
+
+
+def buscar_canales(directorio_prueba):
+    """
+    Busca, entre las carpetas directas de la prueba, las que contienen un archivo <canal>_datos.csv.
+
+    Returns:
+    - Diccionario {canal: ruta_csv} ordenado por canal.
+    """
+    canales = {}
+    for canal in os.listdir(directorio_prueba):
+        ruta_csv = os.path.join(directorio_prueba, canal, f"{canal}_datos.csv")
+        if os.path.isfile(ruta_csv):
+            canales[canal] = ruta_csv
+    return {canal: canales[canal] for canal in sorted(canales, key=clave_orden_canal)}
+
+
+def leer_datos_canal(ruta_csv):
+    """
+    Lee el CSV de datos de un canal y devuelve sus columnas como arrays.
+    """
+    with open(ruta_csv, newline='') as archivo_csv:
+        lector = csv.reader(archivo_csv)
+        next(lector, None)
+        filas = [[float(valor) for valor in fila] for fila in lector if fila]
+
+    columnas = np.array(filas, dtype=float).reshape(-1, 6).T
+    return {
+        "voltajes": columnas[0],
+        "corrientes": columnas[1],
+        "voltajes_scb": columnas[2],
+        "temperaturas_scb": columnas[3],
+        "temperaturas_vrb": columnas[4],
+        "delta_temperaturas": columnas[5],
+    }
+
+
+def calcular_metricas(delta_temp, threshold_temp):
+    """
+    Calcula las métricas de error de un canal (las mismas del archivo de métricas).
+    """
+    if delta_temp.size == 0:
+        return {
+            "promedio_error": math.nan, "promedio_error_abs": math.nan,
+            "error_maximo": math.nan, "desviacion_estandar": math.nan,
+            "rmsd": math.nan, "pasa": False, "muestras": 0,
+        }
+    rmsd = float(np.sqrt(np.mean(delta_temp ** 2)))
+    return {
+        "promedio_error": float(np.mean(delta_temp)),
+        "promedio_error_abs": float(np.mean(np.abs(delta_temp))),
+        "error_maximo": float(np.max(np.abs(delta_temp))),
+        "desviacion_estandar": float(np.std(delta_temp)),
+        "rmsd": rmsd,
+        "pasa": rmsd <= threshold_temp,
+        "muestras": int(delta_temp.size),
+    }
+
+
+def leer_parametros(directorio):
+    """
+    Lee los parámetros de la prueba guardados por el script de adquisición, si existen.
+    """
+    ruta_parametros = os.path.join(directorio, NOMBRE_ARCHIVO_PARAMETROS)
+    if not os.path.exists(ruta_parametros):
+        return {}
+    with open(ruta_parametros) as archivo_parametros:
+        return json.load(archivo_parametros)
+
+
+def generar_figura_canales(resultados, threshold_temp, columnas=6):
+    """
+    Genera en una sola figura la cuadrícula de gráficas (Δ Temperatura vs Temperatura VRB)
+    de todos los canales, con ejes compartidos y fondo según el estado del canal.
+    """
+    filas = max(1, math.ceil(len(resultados) / columnas))
+    figura = Figure(figsize=(3 * columnas, 2.2 * filas))
+    FigureCanvasAgg(figura)
+    ejes = figura.subplots(filas, columnas, sharex=True, sharey=True, squeeze=False)
+
+    for eje, (canal, (datos, metricas)) in zip(ejes.flat, resultados.items()):
+        eje.set_facecolor(COLOR_PASS if metricas["pasa"] else COLOR_NO_PASS)
+        eje.axhspan(-threshold_temp, threshold_temp, color="white", alpha=0.6, zorder=0)
+        eje.plot(datos["temperaturas_vrb"], datos["delta_temperaturas"], ".-", markersize=2, linewidth=0.8)
+        eje.set_title(f"{canal}  RMS {metricas['rmsd']:.2f} °C", fontsize=9)
+        eje.grid(linewidth=0.3)
+
+    for eje in ejes.flat[len(resultados):]:
+        eje.set_visible(False)
+
+    for eje in ejes[-1]:
+        eje.set_xlabel("Temperatura VRB (°C)", fontsize=8)
+    for eje in ejes[:, 0]:
+        eje.set_ylabel("Δ Temp. (°C)", fontsize=8)
+
+    figura.tight_layout()
+    return figura
+
+
+def _html_reporte(nombre_prueba, resultados, parametros, threshold_temp, imagen_png):
+    """
+    Construye el documento HTML autocontenido (la imagen va embebida en base64).
+    """
+    filas_tabla = []
+    for canal, (_, metricas) in resultados.items():
+        estado = "Pass" if metricas["pasa"] else "No Pass"
+        color = COLOR_PASS if metricas["pasa"] else COLOR_NO_PASS
+        filas_tabla.append(
+            f"<tr style=\"background:{color}\"><td>{html.escape(canal)}</td><td>{estado}</td>"
+            f"<td>{metricas['rmsd']:.3f}</td><td>{metricas['desviacion_estandar']:.3f}</td>"
+            f"<td>{metricas['error_maximo']:.3f}</td><td>{metricas['promedio_error']:.3f}</td>"
+            f"<td>{metricas['muestras']}</td></tr>"
+        )
+    filas_parametros = "".join(
+        f"<tr><td>{html.escape(str(clave))}</td><td>{html.escape(str(valor))}</td></tr>"
+        for clave, valor in parametros.items()
+    )
+    aprobados = sum(1 for _, metricas in resultados.values() if metricas["pasa"])
+    imagen = base64.b64encode(imagen_png).decode("ascii")
+
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>SCB QC - {html.escape(nombre_prueba)}</title>
+<style>
+body {{ font-family: "Open Sans", sans-serif; margin: 20px; }}
+table {{ border-collapse: collapse; margin-bottom: 20px; }}
+td, th {{ border: 1px solid #999; padding: 3px 10px; text-align: center; }}
+th {{ background: #e0e0e0; }}
+img {{ max-width: 100%; }}
+</style></head><body>
+<h1>Quality Control for the Signal Conditioning Board</h1>
+<h2>Test: {html.escape(nombre_prueba)} &mdash; {aprobados}/{len(resultados)} channels pass</h2>
+<h3>Test Parameters</h3>
+<table><tr><th>Parameter</th><th>Value</th></tr>{filas_parametros}</table>
+<h3>Test Results (threshold {threshold_temp:.3f} °C)</h3>
+<table><tr><th>Channel</th><th>Test Result</th><th>Error (RMS °C)</th><th>STDV (°C)</th>
+<th>Maximum Error (°C)</th><th>Mean Error (°C)</th><th>Samples</th></tr>
+{"".join(filas_tabla)}</table>
+<h3>Δ Temperature vs VRB Temperature</h3>
+<img src="data:image/png;base64,{imagen}">
+</body></html>
+"""
+
+
+def _figura_tabla(nombre_prueba, resultados, parametros, threshold_temp):
+    """
+    Genera la página de resumen (parámetros y tabla de resultados) para el reporte PDF.
+    """
+    figura = Figure(figsize=(8.27, 11.69))
+    FigureCanvasAgg(figura)
+    eje = figura.add_subplot(111)
+    eje.axis("off")
+    eje.set_title(f"SCB QC - {nombre_prueba} (threshold {threshold_temp:.3f} °C)")
+
+    # Las listas (p. ej. los canales) se escriben separadas por comas y en varias líneas para no salir de la página
+    lineas_parametros = []
+    for clave, valor in parametros.items():
+        if isinstance(valor, (list, tuple)):
+            valor = ", ".join(str(elemento) for elemento in valor)
+        lineas_parametros.append(textwrap.fill(f"{clave}: {valor}", width=90, subsequent_indent="    "))
+    texto_parametros = "\n".join(lineas_parametros)
+    eje.text(0, 1, texto_parametros, va="top", fontsize=8, transform=eje.transAxes)
+
+    celdas, colores = [], []
+    for canal, (_, metricas) in resultados.items():
+        celdas.append([
+            canal, "Pass" if metricas["pasa"] else "No Pass", f"{metricas['rmsd']:.3f}",
+            f"{metricas['desviacion_estandar']:.3f}", f"{metricas['error_maximo']:.3f}",
+        ])
+        colores.append([COLOR_PASS if metricas["pasa"] else COLOR_NO_PASS] * 5)
+    if celdas:
+        eje.table(
+            cellText=celdas, cellColours=colores, loc="lower center",
+            colLabels=["Channel", "Test Result", "Error (RMS °C)", "STDV (°C)", "Maximum Error (°C)"],
+        )
+    return figura
+
+
+def generar_reporte(directorio_prueba, temp_threshold=None, formato="html", ruta_salida=None):
+    """
+    Genera el reporte consolidado de la prueba en un solo documento.
+
+    Parameters:
+    - directorio_prueba: Ruta de la prueba con las carpetas de cada canal.
+    - temp_threshold: Umbral para la validación del error RMS. Si es None se toma de los parámetros de la prueba.
+    - formato: "html" o "pdf".
+    - ruta_salida: Ruta del archivo generado. Por defecto reporte_<prueba>.<formato> en directorio_prueba.
+
+    Returns:
+    - Ruta del reporte generado.
+    """
+    if formato not in ("html", "pdf"):
+        raise ValueError(f"Formato de reporte no soportado: {formato}")
+
+    canales = buscar_canales(directorio_prueba)
+    if not canales:
+        raise ValueError(f"No se encontraron datos de canales en {directorio_prueba}")
+
+    parametros = leer_parametros(directorio_prueba)
+    if temp_threshold is None:
+        temp_threshold = float(parametros.get("temp_threshold", 2.0))
+
+    resultados = {}
+    for canal, ruta_csv in canales.items():
+        datos = leer_datos_canal(ruta_csv)
+        resultados[canal] = (datos, calcular_metricas(datos["delta_temperaturas"], temp_threshold))
+
+    nombre_prueba = os.path.basename(os.path.normpath(directorio_prueba))
+    parametros = dict(parametros, reporte_generado=time.strftime("%Y-%m-%d %H:%M:%S"))
+    if ruta_salida is None:
+        ruta_salida = os.path.join(directorio_prueba, f"reporte_{nombre_prueba}.{formato}")
+
+    figura = generar_figura_canales(resultados, temp_threshold)
+    if formato == "html":
+        buffer_png = io.BytesIO()
+        figura.savefig(buffer_png, format="png", dpi=100)
+        with open(ruta_salida, mode='w', encoding="utf-8") as archivo_html:
+            archivo_html.write(
+                _html_reporte(nombre_prueba, resultados, parametros, temp_threshold, buffer_png.getvalue())
+            )
+    else:
+        from matplotlib.backends.backend_pdf import PdfPages
+        with PdfPages(ruta_salida) as pdf:
+            pdf.savefig(_figura_tabla(nombre_prueba, resultados, parametros, temp_threshold))
+            pdf.savefig(figura)
+
+    print(f"Reporte de {len(resultados)} canales guardado en {ruta_salida}")
+    return ruta_salida
+
+
+if __name__ == "__main__":
+    if not 2 <= len(sys.argv) <= 4:
+        print("Uso: python3 reporte.py <directorio_prueba> [temp_threshold] [html|pdf]")
+        sys.exit(1)
+
+    generar_reporte(
+        sys.argv[1],
+        float(sys.argv[2]) if len(sys.argv) > 2 else None,
+        sys.argv[3] if len(sys.argv) > 3 else "html",
+    )
@@ -0,0 +1,68 @@
+"""
+Lectura y escritura de los archivos de resultados de cada canal (<canal>_metricas.csv
+y <canal>_datos.csv). Lo usan tanto el análisis, que los escribe, como la interfaz
+gráfica, que los lee; no importa NumPy, Pandas ni Matplotlib para no retrasar el
+arranque de la interfaz.
+
+Autor: Diego Alejandro Vera Ortega
+Fecha: 18/11/2024
+"""
+
+import csv
+
+
+def escribir_metricas(ruta_metricas, promedio_error, promedio_error_abs, error_maximo,
+                      desviacion_estandar, error_cuadratico_medio, pasa_calidad):
+    """
+    Guarda las métricas de error del canal en el formato de texto de <canal>_metricas.csv.
+    """
+    with open(ruta_metricas, mode='w') as archivo_metricas:
+        archivo_metricas.write(f"Promedio del Error: {promedio_error:.3f} °C\n")
+        archivo_metricas.write(f"Promedio Absoluto del Error: {promedio_error_abs:.3f} °C\n")
+        archivo_metricas.write(f"Error Máximo: {error_maximo:.3f} °C\n")
+        archivo_metricas.write(f"Desviación Estándar del Error: {desviacion_estandar:.3f} °C\n")
+        archivo_metricas.write(f"Error Cuadrático Medio (RMSD): {error_cuadratico_medio:.3f} °C\n")
+        archivo_metricas.write(f"Estado de Calidad del Canal: {'Pass' if pasa_calidad else 'No Pass'}\n")
+
+
+def leer_metricas(ruta_metricas):
+    """
+    Lee el archivo de métricas de un canal.
+
+    Returns:
+    - Diccionario con promedio_error, promedio_error_abs, error_maximo, desviacion_estandar,
+      error_cuadratico_medio (en °C) y estado_calidad ("Pass" o "No Pass").
+    """
+    with open(ruta_metricas, 'r') as archivo_metricas:
+        lineas = archivo_metricas.readlines()
+
+    valores = [
+        float(linea.split(":")[1].strip().replace(',', '').replace('°C', '').strip())
+        for linea in lineas[:5]
+    ]
+    return {
+        "promedio_error": valores[0],
+        "promedio_error_abs": valores[1],
+        "error_maximo": valores[2],
+        "desviacion_estandar": valores[3],
+        "error_cuadratico_medio": valores[4],
+        "estado_calidad": lineas[5].split(":")[1].strip(),
+    }
+
+
+def leer_deltas(ruta_datos):
+    """
+    Lee la Temperatura VRB y el Delta de Temperatura del archivo <canal>_datos.csv.
+
+    Returns:
+    - Tupla (temperaturas_vrb, delta_temperaturas) como listas de float.
+    """
+    temperaturas_vrb, delta_temperaturas = [], []
+    with open(ruta_datos, newline='') as archivo_csv:
+        lector = csv.reader(archivo_csv)
+        next(lector, None)
+        for fila in lector:
+            if fila:
+                temperaturas_vrb.append(float(fila[4]))
+                delta_temperaturas.append(float(fila[5]))
+    return temperaturas_vrb, delta_temperaturas